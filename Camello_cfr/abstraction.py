@@ -10,6 +10,10 @@ RAISE_SMALL = 2   # ~0.55x pot
 RAISE_LARGE = 3   # ~1x pot
 NUM_ACTIONS = 4
 
+# Betting history encoding: one byte per action, player << HIST_PLAYER_SHIFT | action id
+HIST_PLAYER_SHIFT = 6
+HIST_ACTION_MASK = (1 << HIST_PLAYER_SHIFT) - 1
+
 # Discard action IDs (4..6)
 DISCARD0 = 4
 DISCARD1 = 5
@@ -211,13 +215,17 @@ def get_pot_bucket(pot):
 def get_history_bucket(betting_history):
     """
     Matches C++ get_history_bucket. Returns 0-5.
+
+    betting_history is a bytes-like sequence of encoded actions
+    (player << HIST_PLAYER_SHIFT | action id).
     """
     if not betting_history:
         return 0
     
     raises = 0
     large_raises = 0
-    for _, a in betting_history:
+    for entry in betting_history:
+        a = entry & HIST_ACTION_MASK
         if a == RAISE_SMALL:
             raises += 1
         elif a == RAISE_LARGE:
@@ -235,6 +243,12 @@ def get_history_bucket(betting_history):
     return 5  # very aggressive
 
 
+RANK_CHARS = '23456789TJQKA'
+SUIT_CHARS = 'cdhs'
+# All 52 canonical card strings ('2c' .. 'As') -> rank*4 + suit
+CARD_INTS = {r + s: ri * 4 + si for ri, r in enumerate(RANK_CHARS) for si, s in enumerate(SUIT_CHARS)}
+
+
 def card_str_to_int(card_str):
     """
     Convert card string like 'Ah' to int format (rank*4 + suit).
@@ -242,12 +256,12 @@ def card_str_to_int(card_str):
     Rank: 2=0, 3=1, ..., T=8, J=9, Q=10, K=11, A=12
     Suit: c=0, d=1, h=2, s=3
     """
-    rank_map = {'2': 0, '3': 1, '4': 2, '5': 3, '6': 4, '7': 5, '8': 6, '9': 7,
-                'T': 8, 'J': 9, 'Q': 10, 'K': 11, 'A': 12}
-    suit_map = {'c': 0, 'd': 1, 'h': 2, 's': 3}
-    
-    r = rank_map.get(card_str[0].upper(), 0)
-    s = suit_map.get(card_str[1].lower(), 0)
+    card = CARD_INTS.get(card_str)
+    if card is not None:
+        return card
+    # Non-canonical case ('ah', 'AH'); an unknown rank or suit counts as 0
+    r = max(0, RANK_CHARS.find(card_str[0].upper()))
+    s = max(0, SUIT_CHARS.find(card_str[1].lower()))
     return r * 4 + s
 
 
@@ -1,6 +1,9 @@
 """
 C++ CFR Strategy Loader - V2 Format (75 bytes per node, no stack_bucket)
 
+Legacy V1 files (76 bytes per node, with stack_bucket) load through the same
+path; their keys are repacked into the V2 layout.
+
 Binary format V2:
   Header (24 bytes):
     - magic: 4 bytes ('TOSS')
@@ -21,28 +24,81 @@ Binary format V2:
     - reserved: 2 bytes
 """
 
+import mmap
 import struct
 import os
-from collections import defaultdict
+from collections import Counter, OrderedDict, defaultdict
+from itertools import starmap
+from operator import itemgetter
 
 from abstraction import (
-    FOLD, CHECK_CALL, RAISE_SMALL, RAISE_LARGE, NUM_ACTIONS,
+    FOLD, CHECK_CALL, RAISE_SMALL, RAISE_LARGE,
     get_hole_bucket, get_board_bucket, get_pot_bucket, get_history_bucket,
     card_str_to_int, compute_legal_mask
 )
 
+HEADER = struct.Struct('<IIQQ')
+# Lookup key, byte-for-byte the first 9 bytes of a V2 node:
+# player, street, hole, board, pot, hist, flags (bb_discarded:1, sb_discarded:1, legal_mask:6)
+NODE_KEY = struct.Struct('<BBHHBBB')
+# V2 node viewed as its raw key; regret/strat_sum stay in the mapped file
+NODE_V2 = struct.Struct('<9s66x')
+V2_STRAT_OFFSET = 9 + 32  # strat_sum follows the key and regret
+# V1 node: player, street, hole, board, pot, stack, hist, bb_discarded, sb_discarded,
+# legal_mask, then regret[4] and strat_sum[4]
+NODE_V1 = struct.Struct('<BBHHBBBBBB64x')
+V1_STRAT_OFFSET = 12 + 32
+STRAT = struct.Struct('<4d')
+# Normalized action probs kept per recently hit node (LRU, see get_action_probs)
+PROBS_CACHE_SIZE = 4096
+
+
+def pack_key(player, street, hole_bucket, board_bucket, pot_bucket,
+             hist_bucket, bb_discarded, sb_discarded, legal_mask):
+    """Pack a lookup key exactly like the key bytes of a V2 node."""
+    flags = (int(bb_discarded) << 7) | (int(sb_discarded) << 6) | legal_mask
+    return NODE_KEY.pack(player, street, hole_bucket, board_bucket, pot_bucket,
+                         hist_bucket, flags)
+
+
+def _v1_key(player, street, hole_bucket, board_bucket, pot_bucket, stack_bucket,
+            hist_bucket, bb_discarded, sb_discarded, legal_mask):
+    """Repack a V1 node key into the V2 layout (stack_bucket is dropped)."""
+    return pack_key(player, street, hole_bucket, board_bucket, pot_bucket,
+                    hist_bucket, bb_discarded, sb_discarded, legal_mask)
+
+
+# version -> (node struct, strat_sum offset within a node, record iterator -> key iterator)
+NODE_LAYOUTS = {
+    1: (NODE_V1, V1_STRAT_OFFSET, lambda records: starmap(_v1_key, records)),
+    2: (NODE_V2, V2_STRAT_OFFSET, lambda records: map(itemgetter(0), records)),
+}
+
+
+def pack_miss(street, hole_bucket, board_bucket, pot_bucket, hist_bucket):
+    """Pack a missed lookup's buckets into one int (street:3, hole:16, board:16, pot:5, hist)."""
+    return street | (hole_bucket << 3) | (board_bucket << 19) | (pot_bucket << 35) | (hist_bucket << 40)
+
+
+def unpack_miss(packed):
+    """Inverse of pack_miss."""
+    return (packed & 0x7, (packed >> 3) & 0xFFFF, (packed >> 19) & 0xFFFF,
+            (packed >> 35) & 0x1F, packed >> 40)
+
 
 class CppCFR:
     """Loader and lookup for C++ CFR strategy binary (V2 format)."""
     
     def __init__(self, bin_path='cfr_strategy.bin'):
-        self.nodes = {}
+        self.nodes = {}  # packed key -> byte offset of strat_sum in self._buf
+        self._buf = b''
         self.iterations = 0
         self.num_nodes = 0
         self._last_lookup_hit = False
+        self._probs_cache = OrderedDict()  # packed key -> probs dict, LRU order
         
         # Debug tracking
-        self._miss_counts = defaultdict(int)
+        self._miss_list = []  # packed (street, hole, board, pot, hist) per miss
         self._total_lookups = 0
         self._hits = 0
         
@@ -50,111 +106,56 @@ class CppCFR:
             self._load_binary(bin_path)
         else:
             print(f"[CppCFR] WARNING: Strategy file not found: {bin_path}")
+        
+        # Bound once after loading (the loaders replace self.nodes)
+        self._get_node = self.nodes.get
+        self._miss = self._miss_list.append
     
     def _load_binary(self, path):
-        """Load V2 binary format (75 bytes per node)."""
+        """Load a V2 (75 bytes per node) or legacy V1 (76 bytes per node) strategy file."""
         with open(path, 'rb') as f:
             # Header
-            magic, version, iterations, num_nodes = struct.unpack('<IIQQ', f.read(24))
+            magic, version, iterations, num_nodes = HEADER.unpack(f.read(HEADER.size))
             
             if magic != 0x544F5353:  # 'TOSS'
                 raise ValueError(f"Invalid magic: {hex(magic)}")
-            
-            if version == 1:
-                print(f"[CppCFR] WARNING: V1 format detected, attempting V1 load...")
-                self._load_binary_v1(path)
-                return
-            elif version != 2:
+            if version not in NODE_LAYOUTS:
                 raise ValueError(f"Unsupported version: {version}")
+            if version == 1:
+                print(f"[CppCFR] WARNING: V1 format detected, stack_bucket will be ignored")
+            node, strat_offset, make_keys = NODE_LAYOUTS[version]
             
             self.iterations = iterations
             self.num_nodes = num_nodes
             
-            print(f"[CppCFR] Loading V2: {num_nodes} nodes, {iterations} iterations")
+            print(f"[CppCFR] Loading V{version}: {num_nodes} nodes, {iterations} iterations")
             
-            # Read nodes (75 bytes each)
-            for _ in range(num_nodes):
-                data = f.read(75)
-                if len(data) < 75:
-                    break
-                
-                # Unpack key (9 bytes)
-                player = data[0]
-                street = data[1]
-                hole_bucket = struct.unpack('<H', data[2:4])[0]
-                board_bucket = struct.unpack('<H', data[4:6])[0]
-                pot_bucket = data[6]
-                hist_bucket = data[7]
-                flags = data[8]
-                
-                bb_discarded = (flags & 0x80) != 0
-                sb_discarded = (flags & 0x40) != 0
-                legal_mask = flags & 0x3F
-                
-                # Unpack data (64 bytes)
-                regret = struct.unpack('<4d', data[9:41])
-                strat_sum = struct.unpack('<4d', data[41:73])
-                # reserved = struct.unpack('<H', data[73:75])  # Ignored
-                
-                # Create key tuple
-                key = (player, street, hole_bucket, board_bucket, pot_bucket,
-                       hist_bucket, int(bb_discarded), int(sb_discarded), legal_mask)
-                
-                self.nodes[key] = {
-                    'regret': list(regret),
-                    'strat_sum': list(strat_sum)
-                }
+            # Keep the file mapped read-only for the life of the bot: strat_sum
+            # is decoded straight from the mapping on each hit, so every bot
+            # process loading this file shares the same page-cache pages
+            # instead of holding its own decoded copy. Only the key index
+            # below is per-process.
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            avail = (len(mm) - HEADER.size) // node.size
+            end = HEADER.size + min(num_nodes, avail) * node.size
+            view = memoryview(mm)[HEADER.size:end]
+            try:
+                # Keys zipped with their strat_sum offsets go straight into
+                # dict(); for V2 the whole per-node loop runs in C.
+                keys = make_keys(node.iter_unpack(view))
+                offsets = range(HEADER.size + strat_offset, end, node.size)
+                self.nodes = dict(zip(keys, offsets))
+            finally:
+                view.release()
+            self._buf = mm
             
             print(f"[CppCFR] Loaded {len(self.nodes)} nodes")
     
-    def _load_binary_v1(self, path):
-        """Fallback loader for V1 format (with stack_bucket)."""
-        with open(path, 'rb') as f:
-            # Header
-            magic, version, iterations, num_nodes = struct.unpack('<IIQQ', f.read(24))
-            
-            self.iterations = iterations
-            self.num_nodes = num_nodes
-            
-            print(f"[CppCFR] Loading V1: {num_nodes} nodes, {iterations} iterations")
-            
-            # V1 format has 10-byte key + 64-byte data = 74+ bytes per node
-            # Try to detect node size
-            remaining = os.path.getsize(path) - 24
-            bytes_per_node = remaining // num_nodes if num_nodes > 0 else 74
-            
-            for _ in range(num_nodes):
-                # V1 key (10 bytes with stack_bucket)
-                player = struct.unpack('B', f.read(1))[0]
-                street = struct.unpack('B', f.read(1))[0]
-                hole_bucket = struct.unpack('<H', f.read(2))[0]
-                board_bucket = struct.unpack('<H', f.read(2))[0]
-                pot_bucket = struct.unpack('B', f.read(1))[0]
-                stack_bucket = struct.unpack('B', f.read(1))[0]  # V1 has this
-                hist_bucket = struct.unpack('B', f.read(1))[0]
-                bb_discarded = struct.unpack('B', f.read(1))[0]
-                sb_discarded = struct.unpack('B', f.read(1))[0]
-                legal_mask = struct.unpack('B', f.read(1))[0]
-                
-                regret = struct.unpack('<4d', f.read(32))
-                strat_sum = struct.unpack('<4d', f.read(32))
-                
-                # Convert to V2 key format (ignore stack_bucket)
-                key = (player, street, hole_bucket, board_bucket, pot_bucket,
-                       hist_bucket, bb_discarded, sb_discarded, legal_mask)
-                
-                self.nodes[key] = {
-                    'regret': list(regret),
-                    'strat_sum': list(strat_sum)
-                }
-            
-            print(f"[CppCFR] Loaded {len(self.nodes)} nodes (V1 format)")
-    
     def _make_key(self, player, street, hole_bucket, board_bucket, pot_bucket,
                   hist_bucket, bb_discarded, sb_discarded, legal_mask):
-        """Create lookup key tuple."""
-        return (player, street, hole_bucket, board_bucket, pot_bucket,
-                hist_bucket, int(bb_discarded), int(sb_discarded), legal_mask)
+        """Create lookup key (packed exactly like the key bytes of a V2 node)."""
+        return pack_key(player, street, hole_bucket, board_bucket, pot_bucket,
+                        hist_bucket, bb_discarded, sb_discarded, legal_mask)
     
     def get_action_probs(self, player, street, hole_cards, board_cards, pot,
                          effective_stack, betting_history, bb_discarded, sb_discarded,
@@ -169,13 +170,16 @@ class CppCFR:
             board_cards: List of card strings
             pot: Current pot size
             effective_stack: Min of both stacks
-            betting_history: List of (player, action_id) tuples
+            betting_history: bytes-like, one byte per action
+                (player << HIST_PLAYER_SHIFT | action_id, see abstraction)
             bb_discarded: Whether BB has discarded
             sb_discarded: Whether SB has discarded
-            legal_actions: List of legal action IDs
+            legal_actions: List of legal betting action IDs; callers guarantee
+                each is in [0, NUM_ACTIONS), so no per-element bound check is done
         
         Returns:
-            Dict mapping action_id -> probability
+            Dict mapping action_id -> probability. For hits the dict is
+            shared with later lookups of the same node; do not mutate it.
         """
         self._total_lookups += 1
         
@@ -194,43 +198,48 @@ class CppCFR:
         # print(f"[DEBUG] Lookup: street={street}, hole={hole_bucket}, board={board_bucket}, pot={pot_bucket}, hist={hist_bucket}, bb={bb_discarded}, sb={sb_discarded}")
         
         # Lookup
-        node = self.nodes.get(key)
+        node = self._get_node(key)
         
         if node is None:
             self._last_lookup_hit = False
-            self._miss_counts[(street, hole_bucket, board_bucket, pot_bucket, hist_bucket)] += 1
+            self._miss(pack_miss(street, hole_bucket, board_bucket, pot_bucket, hist_bucket))
             # Return uniform over legal actions
-            probs = {}
-            for a in legal_actions:
-                if 0 <= a < NUM_ACTIONS:
-                    probs[a] = 1.0 / len(legal_actions)
-            return probs
+            uniform = 1.0 / len(legal_actions)
+            return {a: uniform for a in legal_actions}
         
         self._last_lookup_hit = True
         self._hits += 1
         
+        # The key includes the legal mask, so a cached result covers exactly
+        # the same legal actions
+        cache = self._probs_cache
+        probs = cache.get(key)
+        if probs is not None:
+            cache.move_to_end(key)
+            return probs
+        
         # Regret matching
-        strat_sum = node['strat_sum']
-        total = sum(max(0, strat_sum[a]) for a in legal_actions if 0 <= a < NUM_ACTIONS)
+        strat_sum = STRAT.unpack_from(self._buf, node)
+        positive = [(a, max(0, strat_sum[a])) for a in legal_actions]
+        total = sum(w for _, w in positive)
         
-        probs = {}
         if total > 0:
-            for a in legal_actions:
-                if 0 <= a < NUM_ACTIONS:
-                    probs[a] = max(0, strat_sum[a]) / total
+            probs = {a: w / total for a, w in positive}
         else:
             # Uniform if no strategy accumulated
-            for a in legal_actions:
-                if 0 <= a < NUM_ACTIONS:
-                    probs[a] = 1.0 / len(legal_actions)
+            uniform = 1.0 / len(legal_actions)
+            probs = {a: uniform for a in legal_actions}
         
+        cache[key] = probs
+        if len(cache) > PROBS_CACHE_SIZE:
+            cache.popitem(last=False)
         return probs
     
     def debug_miss_summary(self, topk=5):
         """Get summary of most common misses."""
-        sorted_misses = sorted(self._miss_counts.items(), key=lambda x: -x[1])[:topk]
         lines = ["[CppCFR] Top misses:"]
-        for (street, hole, board, pot, hist), count in sorted_misses:
+        for packed, count in Counter(self._miss_list).most_common(topk):
+            street, hole, board, pot, hist = unpack_miss(packed)
             lines.append(f"  street={street} hole={hole} board={board} pot={pot} hist={hist}: {count}")
         return "\n".join(lines)
     
@@ -250,7 +259,7 @@ class CppCFR:
         """Get distribution of nodes by history bucket."""
         hist_counts = defaultdict(int)
         for key in self.nodes:
-            hist_counts[key[5]] += 1  # hist_bucket is at index 5
+            hist_counts[key[7]] += 1  # hist_bucket is byte 7 of the packed key
         
         lines = ["[CppCFR] Nodes by history bucket:"]
         for hist in sorted(hist_counts.keys()):
@@ -17,18 +17,78 @@ import random
 import os
 import pickle
 import pkrbot
+from bisect import bisect_right
+from collections import namedtuple
+from functools import lru_cache
 
 from cpp_cfr import CppCFR
 from abstraction import (
-    FOLD, CHECK_CALL, RAISE_SMALL, RAISE_LARGE, NUM_ACTIONS,
+    FOLD, CHECK_CALL, RAISE_SMALL, RAISE_LARGE, NUM_ACTIONS, HIST_PLAYER_SHIFT,
     STREET_PREFLOP, STREET_BB_DISCARD, STREET_SB_DISCARD, STREET_FLOP_BET, STREET_TURN, STREET_RIVER,
     BIG_BLIND
 )
 
 FINAL_BOARD_CARDS = 6
+MC_CHECK_EVERY = 50  # sims between early-stop checks in Player._simulate_equity
+
+# Suit pattern of a rank-sorted 3-card hand, indexed by
+# (s0 == s1) << 2 | (s0 == s2) << 1 | (s1 == s2); 3, 5 and 6 cannot occur
+_SUIT_PATTERNS = ('___', '_AA', 'A_A', None, 'AA_', None, None, 'AAA')
+
+_SUIT_IDX = {'c': 0, 'd': 1, 'h': 2, 's': 3}
+
+# pkrbot.handtype() name -> opponent hand tier used by the MC opp_bias filter
+_HANDTYPE_TIER = {
+    "High Card": 0, "Pair": 1, "Two Pair": 2, "Trips": 3, "Straight": 4,
+    "Flush": 5, "Full House": 6, "Quads": 7, "Straight Flush": 8,
+}
+
+# pkrbot.handtype() name -> base nuttedness of our made hand
+_HANDTYPE_NUTTEDNESS = {
+    'Straight Flush': 12, 'Quads': 11, 'Full House': 8, 'Flush': 6,
+    'Straight': 5, 'Trips': 3, 'Two Pair': 1, 'Pair': 0, 'High Card': 0,
+}
+
+# Card rank by ord(rank char): '2'..'9' -> 2..9, T/J/Q/K/A -> 10..14
+_RANK_LUT = bytes('23456789TJQKA'.find(chr(i)) + 2 if chr(i) in '23456789TJQKA' else 0 for i in range(128))
+
+# Sim-count multipliers: by board length (capped at 6), and by remaining game
+# clock, where _CLOCK_VALS[i] applies below _CLOCK_CUTS[i]
+_STREET_MULT = (0.6, 1.0, 1.0, 1.3, 1.3, 1.6, 1.6)
+_CLOCK_CUTS = (7.0, 12.0, 20.0, 30.0, 45.0)
+_CLOCK_VALS = (0.10, 0.30, 0.50, 0.70, 0.90, 1.0)
+
+# Result of Player._analyze_bet; min_nut is the nuttedness needed to continue
+BetInfo = namedtuple('BetInfo', 'type overbet shove bet_to_pot commits_us min_nut')
+NO_BET = BetInfo('NO_BET', False, False, 0.0, False, 0)
+
+# Skeleton action type -> CFR action for the betting history (raises are
+# split into small/large by size at the call site)
+_ACTION_TO_CFR = {FoldAction: FOLD, CheckAction: CHECK_CALL, CallAction: CHECK_CALL}
+
+# Per-decision state, built once in Player.get_action and passed to the
+# betting methods so they don't each re-read it from round_state
+DecisionContext = namedtuple('DecisionContext', 'game_state round_state active_player legal board hole '
+                                                'my_stack opp_stack pot continue_cost street')
+
+
+@lru_cache(maxsize=None)
+def _card_of(card_str):
+    """Interned pkrbot.Card for a card string; only 52 distinct cards exist."""
+    return pkrbot.Card(card_str)
 
 
 class Player(Bot):
+    # Every attribute the bot assigns; a new self.X must be added here
+    __slots__ = (
+        'cfr', 'betting_history', 'bb_discarded', 'sb_discarded', 'cfr_hits', 'cfr_misses',
+        'base_sims_post', 'base_sims_discard', 'base_sims_pre', '_rng',
+        '_deck_template', '_card_bit', '_deck_slots',
+        'cruise_mode', '_round_cache', '_hole_strs_cache', '_board_strs_cache',
+        '_preflop_cache_key', '_preflop_cache_val', 'preflop_table',
+        'total_hands', 'opponent_fold_count', 'opponent_overbet_count', 'opponent_overbet_showdown_wins',
+    )
+
     def __init__(self):
         # ==================
         # CFR Strategy Setup
@@ -37,8 +97,9 @@ class Player(Bot):
         self.cfr = CppCFR(bin_path=bin_path)
         print(f"[Player] CFR nodes loaded: {self.cfr.num_nodes}")
         
-        # Betting history for current hand: list of (player, action_id)
-        self.betting_history = []
+        # Betting history for current hand: one byte per action,
+        # player << HIST_PLAYER_SHIFT | action_id
+        self.betting_history = bytearray()
         
         # Track discards
         self.bb_discarded = False
@@ -55,11 +116,36 @@ class Player(Bot):
         self.base_sims_discard = 400
         self.base_sims_pre = 500
 
+        # Single RNG instance for all of the bot's own sampling (CFR action
+        # draws, MC card draws) instead of the shared module-level state
+        self._rng = random.Random()
+
+        # Canonical 52-card template for MC draws, with cards addressed by a
+        # 52-bit mask instead of list.remove scans
+        self._deck_template = tuple(pkrbot.Deck().cards)
+        self._card_bit = {str(c): 1 << i for i, c in enumerate(self._deck_template)}
+        self._deck_slots = tuple(zip(self._deck_template, (1 << i for i in range(len(self._deck_template)))))
+        for c in self._deck_template:
+            _card_of(str(c))
+
         # ==================
         # Cruise Control
         # ==================
         self.cruise_mode = False
         
+        # Per-round memo of board/hand/bet/cruise analysis (see _round_memo)
+        # and of full-length postflop MC equities
+        self._round_cache = {}
+
+        # Card-string conversions for the CFR lookup, keyed by card count
+        # (see _cached_hole_strs / _cached_board_strs)
+        self._hole_strs_cache = (-1, None)
+        self._board_strs_cache = (-1, None)
+        
+        # Preflop equity of the current hand (see mc_preflop_action)
+        self._preflop_cache_key = None
+        self._preflop_cache_val = None
+        
         # ==================
         # Opponent Tracking
         # ==================
@@ -87,74 +173,78 @@ class Player(Bot):
 
     def _normalize_hand(self, cards):
         """Normalize a 3-card hand for table lookup."""
-        rank_map = {'2':2,'3':3,'4':4,'5':5,'6':6,'7':7,'8':8,'9':9,
-                    'T':10,'J':11,'Q':12,'K':13,'A':14}
-        
-        cards_info = []
-        for card in cards:
-            card_str = str(card)
-            cards_info.append((rank_map[card_str[0]], card_str[1]))
-        
-        cards_info.sort(key=lambda x: x[0], reverse=True)
-        ranks = [c[0] for c in cards_info]
-        suits = [c[1] for c in cards_info]
-        
-        if suits[0] == suits[1] == suits[2]:
-            suit_pattern = 'AAA'
-        elif suits[0] == suits[1]:
-            suit_pattern = 'AA_'
-        elif suits[0] == suits[2]:
-            suit_pattern = 'A_A'
-        elif suits[1] == suits[2]:
-            suit_pattern = '_AA'
-        else:
-            suit_pattern = '___'
+        c0, c1, c2 = str(cards[0]), str(cards[1]), str(cards[2])
+        r0, r1, r2 = _RANK_LUT[ord(c0[0])], _RANK_LUT[ord(c1[0])], _RANK_LUT[ord(c2[0])]
+        s0, s1, s2 = c0[1], c1[1], c2[1]
+        
+        # Stable descending sort by rank (equal ranks keep their dealt order)
+        if r0 < r1:
+            r0, r1, s0, s1 = r1, r0, s1, s0
+        if r1 < r2:
+            r1, r2, s1, s2 = r2, r1, s2, s1
+            if r0 < r1:
+                r0, r1, s0, s1 = r1, r0, s1, s0
         
-        return (ranks[0], ranks[1], ranks[2], suit_pattern)
+        suit_key = ((s0 == s1) << 2) | ((s0 == s2) << 1) | (s1 == s2)
+        return (r0, r1, r2, _SUIT_PATTERNS[suit_key])
 
     def _to_card_list(self, cards):
-        """Safely convert cards to pkrbot.Card objects."""
-        out = []
-        for c in cards:
-            if isinstance(c, pkrbot.Card):
-                out.append(c)
-            else:
-                out.append(pkrbot.Card(str(c)))
-        return out
+        """Safely convert cards to pkrbot.Card objects (interned, see _card_of)."""
+        # Already-converted lists pass through as-is; card lists are never mixed
+        if isinstance(cards, list) and cards and isinstance(cards[0], pkrbot.Card):
+            return cards
+        return [c if isinstance(c, pkrbot.Card) else _card_of(str(c)) for c in cards]
 
     def _to_card_strings(self, cards):
         """Convert cards to string representations."""
-        return [str(c) for c in cards]
+        return list(map(str, cards))
+
+    def _cached_hole_strs(self, hole):
+        """_to_card_strings(hole), reused until the hole changes size (our discard)."""
+        n, strs = self._hole_strs_cache
+        if n != len(hole):
+            strs = self._to_card_strings(hole)
+            self._hole_strs_cache = (len(hole), strs)
+        return strs
+
+    def _cached_board_strs(self, board):
+        """_to_card_strings(board), reused until the board grows."""
+        n, strs = self._board_strs_cache
+        if n != len(board):
+            strs = self._to_card_strings(board)
+            self._board_strs_cache = (len(board), strs)
+        return strs
 
     def _get_board_cards(self, round_state):
-        """Return the current public board as a flat list."""
-        return list(round_state.board)
+        """Return the current public board (shared with round_state; do not mutate)."""
+        return round_state.board
+
+    def _extract_state(self, round_state, hero):
+        """(my_pip, opp_pip, continue_cost, my_stack, opp_stack, pot) for hero."""
+        pips = round_state.pips
+        stacks = round_state.stacks
+        my_pip = pips[hero]
+        opp_pip = pips[1 - hero]
+        my_stack = stacks[hero]
+        opp_stack = stacks[1 - hero]
+        pot = 2 * STARTING_STACK - my_stack - opp_stack
+        return my_pip, opp_pip, opp_pip - my_pip, my_stack, opp_stack, pot
+
+    def _round_memo(self, key, compute, *args):
+        """Return compute(*args), memoized under key until the next handle_new_round."""
+        cache = self._round_cache
+        if key in cache:
+            return cache[key]
+        value = cache[key] = compute(*args)
+        return value
 
     def _clock_mult(self, game_clock):
         """Clock multiplier for simulation count."""
-        if game_clock < 7.0:
-            return 0.10
-        elif game_clock < 12.0:
-            return 0.30
-        elif game_clock < 20.0:
-            return 0.50
-        elif game_clock < 30.0:
-            return 0.70
-        elif game_clock < 45.0:
-            return 0.90
-        else:
-            return 1.0
+        return _CLOCK_VALS[bisect_right(_CLOCK_CUTS, game_clock)]
 
     def _get_street_multiplier(self, board_len):
         """Later streets = more meaningful bets."""
-        if board_len == 0:
-            return 0.6
-        elif board_len <= 2:
-            return 1.0
-        elif board_len <= 4:
-            return 1.3
-        else:
-            return 1.6
+        return _STREET_MULT[min(board_len, 6)]
 
     # =====================
     # Cruise Control
@@ -185,7 +275,11 @@ class Player(Bot):
         return bankroll > safety_margin
 
     def _our_cruise_proximity(self, game_state):
-        """How close are WE to cruising?"""
+        """How close are WE to cruising? (memoized per round)"""
+        return self._round_memo(('our_cruise', game_state.bankroll, game_state.round_num),
+                                self._calc_our_cruise_proximity, game_state)
+
+    def _calc_our_cruise_proximity(self, game_state):
         my_bankroll = game_state.bankroll
         remaining = max(1, NUM_ROUNDS - game_state.round_num)
         cruise_threshold = 1.5 * remaining
@@ -205,7 +299,11 @@ class Player(Bot):
             return {'status': 'NORMAL', 'tightness': 1.0, 'fold_more': False, 'avoid_big_pots': False}
 
     def _opponent_cruise_proximity(self, game_state):
-        """How close is OPPONENT to cruising?"""
+        """How close is OPPONENT to cruising? (memoized per round)"""
+        return self._round_memo(('opp_cruise', game_state.bankroll, game_state.round_num),
+                                self._calc_opponent_cruise_proximity, game_state)
+
+    def _calc_opponent_cruise_proximity(self, game_state):
         my_bankroll = game_state.bankroll
         opp_bankroll = -my_bankroll
         remaining = max(1, NUM_ROUNDS - game_state.round_num)
@@ -230,9 +328,13 @@ class Player(Bot):
     # =====================
 
     def _analyze_bet(self, continue_cost, pot, my_stack, opp_stack):
-        """Analyze the opponent's bet."""
+        """Analyze the opponent's bet. (memoized per round)"""
+        return self._round_memo(('bet', continue_cost, pot, my_stack, opp_stack),
+                                self._calc_analyze_bet, continue_cost, pot, my_stack, opp_stack)
+
+    def _calc_analyze_bet(self, continue_cost, pot, my_stack, opp_stack):
         if continue_cost <= 0:
-            return {'type': 'NO_BET', 'overbet': False, 'shove': False}
+            return NO_BET
         
         pot_before_bet = pot - continue_cost
         if pot_before_bet <= 0:
@@ -243,44 +345,46 @@ class Player(Bot):
         commits_us = continue_cost >= my_stack * 0.5
         
         if is_shove:
-            return {'type': 'SHOVE', 'overbet': True, 'shove': True, 'bet_to_pot': bet_to_pot, 'commits_us': commits_us, 'min_nuttedness_to_call': 7}
+            return BetInfo('SHOVE', True, True, bet_to_pot, commits_us, 7)
         elif bet_to_pot > 1.5:
-            return {'type': 'MASSIVE_OVERBET', 'overbet': True, 'shove': False, 'bet_to_pot': bet_to_pot, 'commits_us': commits_us, 'min_nuttedness_to_call': 6}
+            return BetInfo('MASSIVE_OVERBET', True, False, bet_to_pot, commits_us, 6)
         elif bet_to_pot > 1.0:
-            return {'type': 'OVERBET', 'overbet': True, 'shove': False, 'bet_to_pot': bet_to_pot, 'commits_us': commits_us, 'min_nuttedness_to_call': 5}
+            return BetInfo('OVERBET', True, False, bet_to_pot, commits_us, 5)
         elif bet_to_pot > 0.66:
-            return {'type': 'LARGE', 'overbet': False, 'shove': False, 'bet_to_pot': bet_to_pot, 'commits_us': commits_us, 'min_nuttedness_to_call': 3}
+            return BetInfo('LARGE', False, False, bet_to_pot, commits_us, 3)
         elif bet_to_pot > 0.33:
-            return {'type': 'STANDARD', 'overbet': False, 'shove': False, 'bet_to_pot': bet_to_pot, 'commits_us': commits_us, 'min_nuttedness_to_call': 0}
+            return BetInfo('STANDARD', False, False, bet_to_pot, commits_us, 0)
         else:
-            return {'type': 'SMALL', 'overbet': False, 'shove': False, 'bet_to_pot': bet_to_pot, 'commits_us': commits_us, 'min_nuttedness_to_call': 0}
+            return BetInfo('SMALL', False, False, bet_to_pot, commits_us, 0)
 
     # =====================
     # Board & Hand Analysis
     # =====================
 
     def _compute_board_nuttedness(self, board):
-        """How many nutted hands are possible on this board."""
+        """How many nutted hands are possible on this board. (memoized per round)"""
+        return self._round_memo(('board_nut', tuple(map(str, board))),
+                                self._calc_board_nuttedness, board)
+
+    def _calc_board_nuttedness(self, board):
         if len(board) < 2:
             return 0.0
         
-        board_cards = self._to_card_list(board)
-        ranks = []
-        suits = []
-        rank_map = {'2':2,'3':3,'4':4,'5':5,'6':6,'7':7,'8':8,'9':9,'T':10,'J':11,'Q':12,'K':13,'A':14}
-        
-        for c in board_cards:
+        # Fixed-size counters indexed by suit / rank, plus a rank bitmask
+        suit_counts = bytearray(4)
+        rank_counts = bytearray(15)
+        rank_mask = 0
+        for c in board:
             cs = str(c)
-            ranks.append(rank_map[cs[0]])
-            suits.append(cs[1])
+            r = _RANK_LUT[ord(cs[0])]
+            suit_counts[_SUIT_IDX[cs[1]]] += 1
+            rank_counts[r] += 1
+            rank_mask |= 1 << r
         
         board_nut_score = 0.0
         
         # Flush possibility
-        suit_counts = {}
-        for s in suits:
-            suit_counts[s] = suit_counts.get(s, 0) + 1
-        max_suited = max(suit_counts.values()) if suit_counts else 0
+        max_suited = max(suit_counts)
         
         if max_suited >= 5:
             board_nut_score += 8.0
@@ -290,18 +394,18 @@ class Player(Bot):
             board_nut_score += 2.0
         
         # Straight possibility
-        sorted_ranks = sorted(set(ranks))
+        # Board ranks chain while consecutive ranks are at most 2 apart: fill
+        # every single-rank hole, then count the real ranks in each run of
+        # the filled mask (run = its lowest block of contiguous set bits)
+        bridged = rank_mask | ((rank_mask >> 1) & (rank_mask << 1))
         max_connected = 1
-        current_run = 1
-        for i in range(1, len(sorted_ranks)):
-            gap = sorted_ranks[i] - sorted_ranks[i-1]
-            if gap <= 2:
-                current_run += 1
-                max_connected = max(max_connected, current_run)
-            else:
-                current_run = 1
+        while bridged:
+            run = bridged & ~(bridged + (bridged & -bridged))
+            max_connected = max(max_connected, bin(rank_mask & run).count('1'))
+            bridged ^= run
         
-        has_wheel_cards = 14 in ranks and any(r <= 5 for r in ranks)
+        # Ace plus any of 2-5 (bits 2..5 -> 0x3C)
+        has_wheel_cards = bool(rank_mask >> 14 & 1) and bool(rank_mask & 0x3C)
         
         if max_connected >= 5 or (max_connected >= 4 and has_wheel_cards):
             board_nut_score += 6.0
@@ -311,12 +415,8 @@ class Player(Bot):
             board_nut_score += 2.0
         
         # Paired board
-        rank_counts = {}
-        for r in ranks:
-            rank_counts[r] = rank_counts.get(r, 0) + 1
-        
-        max_of_kind = max(rank_counts.values()) if rank_counts else 0
-        num_pairs = sum(1 for c in rank_counts.values() if c >= 2)
+        max_of_kind = max(rank_counts)
+        num_pairs = sum(1 for c in rank_counts if c >= 2)
         
         if max_of_kind >= 3:
             board_nut_score += 5.0
@@ -328,7 +428,11 @@ class Player(Bot):
         return board_nut_score
 
     def _compute_our_nuttedness(self, hole, board):
-        """How nutted is our hand?"""
+        """How nutted is our hand? (memoized per round)"""
+        return self._round_memo(('our_nut', tuple(map(str, hole)), tuple(map(str, board))),
+                                self._calc_our_nuttedness, hole, board)
+
+    def _calc_our_nuttedness(self, hole, board):
         if len(board) < 2 or len(hole) < 2:
             return 0.0
         
@@ -339,26 +443,21 @@ class Player(Bot):
         our_val = pkrbot.evaluate(all_cards)
         our_type = pkrbot.handtype(our_val)
         
-        nuttedness_map = {
-            'Straight Flush': 12, 'Quads': 11, 'Full House': 8, 'Flush': 6,
-            'Straight': 5, 'Trips': 3, 'Two Pair': 1, 'Pair': 0, 'High Card': 0,
-        }
-        our_nuttedness = nuttedness_map.get(our_type, 0)
+        our_nuttedness = _HANDTYPE_NUTTEDNESS.get(our_type, 0)
         
         # Bonuses for nut versions
         if our_type == 'Flush':
-            suit_counts = {}
-            for c in board_cards:
-                s = str(c)[1]
-                suit_counts[s] = suit_counts.get(s, 0) + 1
-            if suit_counts:
-                flush_suit = max(suit_counts.keys(), key=lambda s: suit_counts[s])
-                hole_has_ace = any(str(c)[0] == 'A' and str(c)[1] == flush_suit for c in hole_cards)
-                if hole_has_ace:
-                    our_nuttedness += 3
+            # Most common board suit (ties go to the one seen first)
+            suits = [_SUIT_IDX[str(c)[1]] for c in board_cards]
+            suit_counts = bytearray(4)
+            for si in suits:
+                suit_counts[si] += 1
+            top = max(suit_counts)
+            flush_suit = next(si for si in suits if suit_counts[si] == top)
+            if 'A' + 'cdhs'[flush_suit] in map(str, hole_cards):
+                our_nuttedness += 3
         elif our_type == 'Full House':
-            rank_map = {'2':2,'3':3,'4':4,'5':5,'6':6,'7':7,'8':8,'9':9,'T':10,'J':11,'Q':12,'K':13,'A':14}
-            hole_ranks = [rank_map[str(c)[0]] for c in hole_cards]
+            hole_ranks = [_RANK_LUT[ord(str(c)[0])] for c in hole_cards]
             if max(hole_ranks) >= 12:
                 our_nuttedness += 2
         
@@ -369,11 +468,8 @@ class Player(Bot):
         board = self._get_board_cards(round_state)
         street_mult = self._get_street_multiplier(len(board))
         
-        my_stack = round_state.stacks[active_player]
-        opp_stack = round_state.stacks[1 - active_player]
-        my_contrib = STARTING_STACK - my_stack
+        my_pip, opp_pip, continue_cost, my_stack, opp_stack, pot = self._extract_state(round_state, active_player)
         opp_contrib = STARTING_STACK - opp_stack
-        pot = my_contrib + opp_contrib
         
         if pot <= 3:
             return 0.0
@@ -384,10 +480,6 @@ class Player(Bot):
         if opp_share > 0.5:
             aggression_score += (opp_share - 0.5) * 10
         
-        my_pip = round_state.pips[active_player]
-        opp_pip = round_state.pips[1 - active_player]
-        continue_cost = opp_pip - my_pip
-        
         if continue_cost > 0:
             pot_before_bet = pot - continue_cost
             bet_fraction = continue_cost / max(1, pot_before_bet)
@@ -429,101 +521,135 @@ class Player(Bot):
         x = frac * street_boost
         return max(0.0, min(1.0, 1.4 * x))
 
-    def mc_equity(self, round_state, my_hole_cards, sims, opp_bias=0.0):
-        raw_board = list(round_state.board)
-        raw_hole = list(my_hole_cards)
-        board = self._to_card_list(raw_board)
-        hole = self._to_card_list(raw_hole)
+    def _unseen_cards(self, known):
+        """Every card of the deck not in `known`, in template order."""
+        card_bit = self._card_bit
+        used_mask = 0
+        for c in known:
+            used_mask |= card_bit[str(c)]
+        return [c for c, bit in self._deck_slots if not used_mask & bit]
 
-        opp_hole_n = 3 if (len(hole) == 3 and len(board) < 2) else 2
-        remaining_board = max(0, FINAL_BOARD_CARDS - len(board))
-
-        deck = pkrbot.Deck()
-        for c in hole + board:
-            if c in deck.cards:
-                deck.cards.remove(c)
-
-        tier = {"High Card": 0, "Pair": 1, "Two Pair": 2, "Trips": 3, "Straight": 4, "Flush": 5, "Full House": 6, "Quads": 7, "Straight Flush": 8}
-        wins = ties = iters = 0
-
-        while iters < sims:
-            deck.shuffle()
-            draw = deck.peek(opp_hole_n + remaining_board)
-            opp = draw[:opp_hole_n]
-            runout = draw[opp_hole_n:]
-
-            my_val = pkrbot.evaluate(hole + board + runout)
-            opp_val = pkrbot.evaluate(opp + board + runout)
-
-            if opp_bias > 0.0:
-                opp_class = pkrbot.handtype(opp_val)
-                t = tier.get(opp_class, 0)
-                accept_p = min(1.0, max(0.18, 1.0 - 0.60 * opp_bias + 0.10 * t + 0.06 * opp_bias * t))
-                if random.random() >= accept_p:
-                    continue
-
-            if my_val > opp_val:
-                wins += 1
-            elif my_val == opp_val:
-                ties += 1
-            iters += 1
+    def _simulate_equity(self, hole, board, opp_hole_n, sims, opp_bias, thresholds=()):
+        """
+        Shared MC loop: hole/board are pkrbot.Card lists, opponent gets opp_hole_n cards.
+        Returns (equity, sims actually run).
 
-        return (wins + 0.5 * ties) / max(1, sims)
+        If thresholds (the equities the caller will compare against) are given,
+        stop early once the estimate is more than 2 standard errors away from
+        every one of them, checked every MC_CHECK_EVERY sims.
+        """
+        remaining_board = max(0, FINAL_BOARD_CARDS - len(board))
+        draw_n = opp_hole_n + remaining_board
+        unseen = self._unseen_cards(hole + board)
+
+        # Everything invariant across sims is bound/built once up front
+        my_known = hole + board
+        sample = self._rng.sample
+        evaluate = pkrbot.evaluate
+        handtype = pkrbot.handtype
+        tier_of = _HANDTYPE_TIER.get
+        wins = ties = total = 0.0
+        weight = 1.0
+        # With the board complete our hand never changes between sims, so
+        # only the opponent's hand needs evaluating inside the loop
+        my_fixed = evaluate(my_known) if remaining_board == 0 else None
+
+        # opp_bias skews the opponent range toward stronger hands. Rather than
+        # rejection-sampling (a random draw per sim and a variable number of
+        # iterations), every sim is kept and weighted by its acceptance
+        # probability, which gives the same estimate in expectation.
+        batch = MC_CHECK_EVERY if thresholds else sims
+        done = 0
+        while done < sims:
+            n = min(batch, sims - done)
+            for _ in range(n):
+                draw = sample(unseen, draw_n)
+
+                # evaluate() ignores card order, so the opponent's 7 cards
+                # are just the board plus the whole draw (hole + runout)
+                my_val = my_fixed if my_fixed is not None else evaluate(my_known + draw[opp_hole_n:])
+                opp_val = evaluate(board + draw)
+
+                if opp_bias > 0.0:
+                    t = tier_of(handtype(opp_val), 0)
+                    weight = min(1.0, max(0.18, 1.0 - 0.60 * opp_bias + 0.10 * t + 0.06 * opp_bias * t))
+
+                if my_val > opp_val:
+                    wins += weight
+                elif my_val == opp_val:
+                    ties += weight
+                total += weight
+            done += n
+
+            if thresholds and done < sims and total > 0:
+                p = (wins + 0.5 * ties) / total
+                margin = 2.0 * (p * (1.0 - p) / done) ** 0.5
+                if all(abs(p - t) > margin for t in thresholds):
+                    break
+
+        return ((wins + 0.5 * ties) / total if total > 0 else 0.0), done
+
+    def mc_equity(self, round_state, my_hole_cards, sims, opp_bias=0.0, thresholds=()):
+        """(equity, sims run); fewer than sims only if thresholds stopped it early."""
+        board = self._to_card_list(round_state.board)
+        hole = self._to_card_list(my_hole_cards)
+        opp_hole_n = 3 if (len(hole) == 3 and len(board) < 2) else 2
+        return self._simulate_equity(hole, board, opp_hole_n, sims, opp_bias, thresholds)
 
     def mc_equity_with_board(self, my_hole_cards, board, sims, opp_bias=0.0):
         board = self._to_card_list(board)
         hole = self._to_card_list(my_hole_cards)
-        remaining_board = max(0, FINAL_BOARD_CARDS - len(board))
-
-        deck = pkrbot.Deck()
-        for c in hole + board:
-            if c in deck.cards:
-                deck.cards.remove(c)
-
-        tier = {"High Card": 0, "Pair": 1, "Two Pair": 2, "Trips": 3, "Straight": 4, "Flush": 5, "Full House": 6, "Quads": 7, "Straight Flush": 8}
-        wins = ties = iters = 0
+        return self._simulate_equity(hole, board, 2, sims, opp_bias)[0]
 
-        while iters < sims:
-            deck.shuffle()
-            draw = deck.peek(2 + remaining_board)
-            opp = draw[:2]
-            runout = draw[2:]
+    # =====================
+    # Discard Logic
+    # =====================
 
-            my_val = pkrbot.evaluate(hole + board + runout)
-            opp_val = pkrbot.evaluate(opp + board + runout)
+    def _discard_equities(self, hole, board, sims):
+        """
+        Equity of each of the 3 possible discards, all scored on the same
+        opponent hands and runouts (common random numbers).
+        
+        The discarded card joins the board, so the set of unseen cards is
+        the same for every choice and one draw per sim serves all three.
+        """
+        remaining_board = max(0, FINAL_BOARD_CARDS - len(board) - 1)
+        draw_n = 2 + remaining_board
+        unseen = self._unseen_cards(hole + board)
 
-            if opp_bias > 0.0:
-                opp_class = pkrbot.handtype(opp_val)
-                t = tier.get(opp_class, 0)
-                accept_p = min(1.0, max(0.18, 1.0 - 0.60 * opp_bias + 0.10 * t + 0.06 * opp_bias * t))
-                if random.random() >= accept_p:
-                    continue
+        # (my known cards, board with the discard) per discard choice
+        options = []
+        for i in range(3):
+            kept = [hole[j] for j in range(3) if j != i]
+            temp_board = board + [hole[i]]
+            options.append((kept + temp_board, temp_board))
 
-            if my_val > opp_val:
-                wins += 1
-            elif my_val == opp_val:
-                ties += 1
-            iters += 1
+        sample = self._rng.sample
+        evaluate = pkrbot.evaluate
+        scores = [0.0, 0.0, 0.0]
 
-        return (wins + 0.5 * ties) / max(1, sims)
+        for _ in range(sims):
+            draw = sample(unseen, draw_n)
+            runout = draw[2:]
+            for i, (my_known, temp_board) in enumerate(options):
+                my_val = evaluate(my_known + runout)
+                opp_val = evaluate(temp_board + draw)
+                if my_val > opp_val:
+                    scores[i] += 1.0
+                elif my_val == opp_val:
+                    scores[i] += 0.5
 
-    # =====================
-    # Discard Logic
-    # =====================
+        return [score / max(1, sims) for score in scores]
 
     def choose_discard_mc(self, game_state, round_state, active_player):
-        hole = list(round_state.hands[active_player])
-        board = self._get_board_cards(round_state)
+        hole = self._to_card_list(round_state.hands[active_player])
+        board = self._to_card_list(self._get_board_cards(round_state))
         sims = int(self.base_sims_discard * self._clock_mult(game_state.game_clock))
 
         best_i = 0
         best_ev = -1.0
         
-        for i in range(3):
-            kept = [hole[j] for j in range(3) if j != i]
-            discarded = hole[i]
-            temp_board = board + [discarded]
-            ev = self.mc_equity_with_board(kept, temp_board, sims=sims, opp_bias=0.0)
+        for i, ev in enumerate(self._discard_equities(hole, board, sims)):
             if ev > best_ev:
                 best_ev = ev
                 best_i = i
@@ -534,30 +660,31 @@ class Player(Bot):
     # MC Fallback: Preflop
     # =====================
 
-    def mc_preflop_action(self, game_state, round_state, active_player):
-        legal = round_state.legal_actions()
-        my_pip = round_state.pips[active_player]
-        opp_pip = round_state.pips[1 - active_player]
-        continue_cost = opp_pip - my_pip
-        my_stack = round_state.stacks[active_player]
-        opp_stack = round_state.stacks[1 - active_player]
-        pot = (STARTING_STACK - my_stack) + (STARTING_STACK - opp_stack)
-        hole = list(round_state.hands[active_player])
+    def mc_preflop_action(self, ctx):
+        game_state, round_state, legal, hole = ctx.game_state, ctx.round_state, ctx.legal, ctx.hole
+        continue_cost, my_stack, opp_stack, pot = ctx.continue_cost, ctx.my_stack, ctx.opp_stack, ctx.pot
 
         our_cruise = self._our_cruise_proximity(game_state)
         opp_cruise = self._opponent_cruise_proximity(game_state)
 
-        # Get equity - use preflop table if available
-        if self.preflop_table:
-            hand_class = self._normalize_hand(hole)
-            if hand_class in self.preflop_table:
-                eq = self.preflop_table[hand_class]['preflop_score']
+        # Get equity - use preflop table if available. The hole is fixed for
+        # the whole preflop street, so reuse the result on repeat decisions.
+        cache_key = frozenset(str(c) for c in hole)
+        if cache_key == self._preflop_cache_key:
+            eq = self._preflop_cache_val
+        else:
+            if self.preflop_table:
+                hand_class = self._normalize_hand(hole)
+                if hand_class in self.preflop_table:
+                    eq = self.preflop_table[hand_class]['preflop_score']
+                else:
+                    sims = int(self.base_sims_pre * self._clock_mult(game_state.game_clock))
+                    eq, _ = self.mc_equity(round_state, hole, sims=sims)
             else:
                 sims = int(self.base_sims_pre * self._clock_mult(game_state.game_clock))
-                eq = self.mc_equity(round_state, hole, sims=sims)
-        else:
-            sims = int(self.base_sims_pre * self._clock_mult(game_state.game_clock))
-            eq = self.mc_equity(round_state, hole, sims=sims)
+                eq, _ = self.mc_equity(round_state, hole, sims=sims)
+            self._preflop_cache_key = cache_key
+            self._preflop_cache_val = eq
 
         tightness = our_cruise['tightness']
         aggression = opp_cruise['aggression']
@@ -566,7 +693,7 @@ class Player(Bot):
             bet_analysis = self._analyze_bet(continue_cost, pot, my_stack, opp_stack)
             pot_odds = continue_cost / (pot + continue_cost)
             
-            if bet_analysis['shove'] or bet_analysis['type'] == 'MASSIVE_OVERBET':
+            if bet_analysis.shove or bet_analysis.type == 'MASSIVE_OVERBET':
                 if eq < 0.58:
                     return FoldAction() if FoldAction in legal else CheckAction()
             
@@ -606,67 +733,89 @@ class Player(Bot):
     # MC Fallback: Postflop
     # =====================
 
-    def mc_postflop_action(self, game_state, round_state, active_player):
-        legal = round_state.legal_actions()
-        board = self._get_board_cards(round_state)
-        street_n = len(board)
-        my_pip = round_state.pips[active_player]
-        opp_pip = round_state.pips[1 - active_player]
-        continue_cost = opp_pip - my_pip
-        my_stack = round_state.stacks[active_player]
-        opp_stack = round_state.stacks[1 - active_player]
-        pot = (STARTING_STACK - my_stack) + (STARTING_STACK - opp_stack)
-        hole = list(round_state.hands[active_player])
+    def mc_postflop_action(self, ctx):
+        game_state, round_state, legal = ctx.game_state, ctx.round_state, ctx.legal
+        board, hole, street_n = ctx.board, ctx.hole, len(ctx.board)
+        continue_cost, my_stack, opp_stack, pot = ctx.continue_cost, ctx.my_stack, ctx.opp_stack, ctx.pot
 
         our_cruise = self._our_cruise_proximity(game_state)
         opp_cruise = self._opponent_cruise_proximity(game_state)
-        danger = self._compute_total_danger(hole, board, round_state, active_player)
+        danger = self._compute_total_danger(hole, board, round_state, ctx.active_player)
         our_nuttedness = danger['our_nuttedness']
 
+        tightness = our_cruise['tightness']
+        aggression = opp_cruise['aggression']
+
+        # Equity cutoffs used below, worked out first so the MC can stop as
+        # soon as its estimate is clearly on one side of all of them
+        if continue_cost > 0:
+            pot_odds = continue_cost / (pot + continue_cost)
+
+            danger_score = danger['total_danger']
+            margin = 0.03 * tightness + max(0, (danger_score - 3) * 0.02)
+            if our_cruise.get('avoid_big_pots', False):
+                margin += 0.05
+
+            if our_nuttedness >= 7:
+                raise_threshold = 0.50
+            elif our_nuttedness >= 5:
+                raise_threshold = 0.60
+            else:
+                raise_threshold = 0.75 / aggression
+            thresholds = (pot_odds + 0.08, pot_odds + margin, raise_threshold)
+        else:
+            base_threshold = 0.50 * tightness
+            board_nut = danger['board_nuttedness']
+
+            if board_nut >= 8 and our_nuttedness < 5:
+                base_threshold += 0.15
+            elif board_nut >= 5 and our_nuttedness < 3:
+                base_threshold += 0.08
+            elif board_nut < 3 and our_nuttedness >= 5:
+                base_threshold -= 0.10
+
+            if our_cruise.get('avoid_big_pots', False):
+                base_threshold += 0.08
+            thresholds = (base_threshold,)
+
         sims = int(self.base_sims_post * self._clock_mult(game_state.game_clock))
         opp_bias = self._opp_bias_from_action(continue_cost, pot, street_n)
-        equity = self.mc_equity(round_state, hole, sims=sims, opp_bias=opp_bias)
 
-        tightness = our_cruise['tightness']
-        aggression = opp_cruise['aggression']
+        # Repeat decisions on the same street (e.g. facing a re-raise) reuse
+        # the equity; early-stopped runs are too coarse to reuse, so only
+        # full-budget results are kept
+        eq_key = ('mc_eq', tuple(map(str, hole)), tuple(map(str, board)), round(opp_bias, 2))
+        equity = self._round_cache.get(eq_key)
+        if equity is None:
+            equity, done = self.mc_equity(round_state, hole, sims=sims, opp_bias=opp_bias,
+                                          thresholds=thresholds)
+            if done >= sims:
+                self._round_cache[eq_key] = equity
 
         if continue_cost > 0:
             bet_analysis = self._analyze_bet(continue_cost, pot, my_stack, opp_stack)
-            pot_odds = continue_cost / (pot + continue_cost)
             
-            if bet_analysis['shove']:
-                min_nut = bet_analysis.get('min_nuttedness_to_call', 7)
+            if bet_analysis.shove:
+                min_nut = bet_analysis.min_nut
                 if our_nuttedness < min_nut:
                     return FoldAction() if FoldAction in legal else CheckAction()
                 return CallAction() if CallAction in legal else CheckAction()
             
-            if bet_analysis['type'] == 'MASSIVE_OVERBET':
-                if our_nuttedness < bet_analysis.get('min_nuttedness_to_call', 6):
+            if bet_analysis.type == 'MASSIVE_OVERBET':
+                if our_nuttedness < bet_analysis.min_nut:
                     return FoldAction() if FoldAction in legal else CheckAction()
             
-            if bet_analysis['type'] == 'OVERBET':
-                if our_nuttedness < bet_analysis.get('min_nuttedness_to_call', 5):
+            if bet_analysis.type == 'OVERBET':
+                if our_nuttedness < bet_analysis.min_nut:
                     return FoldAction() if FoldAction in legal else CheckAction()
             
-            if bet_analysis['type'] == 'LARGE' and our_nuttedness < 3:
+            if bet_analysis.type == 'LARGE' and our_nuttedness < 3:
                 if equity < pot_odds + 0.08:
                     return FoldAction() if FoldAction in legal else CheckAction()
             
-            danger_score = danger['total_danger']
-            margin = 0.03 * tightness + max(0, (danger_score - 3) * 0.02)
-            if our_cruise.get('avoid_big_pots', False):
-                margin += 0.05
-            
             if equity < pot_odds + margin:
                 return FoldAction() if FoldAction in legal else CheckAction()
             
-            if our_nuttedness >= 7:
-                raise_threshold = 0.50
-            elif our_nuttedness >= 5:
-                raise_threshold = 0.60
-            else:
-                raise_threshold = 0.75 / aggression
-            
             if RaiseAction in legal and equity >= raise_threshold and our_nuttedness >= 5:
                 mn, mx = round_state.raise_bounds()
                 mult = 3.0 if our_nuttedness >= 8 else 2.5
@@ -678,19 +827,6 @@ class Player(Bot):
         if RaiseAction not in legal:
             return CheckAction()
 
-        base_threshold = 0.50 * tightness
-        board_nut = danger['board_nuttedness']
-        
-        if board_nut >= 8 and our_nuttedness < 5:
-            base_threshold += 0.15
-        elif board_nut >= 5 and our_nuttedness < 3:
-            base_threshold += 0.08
-        elif board_nut < 3 and our_nuttedness >= 5:
-            base_threshold -= 0.10
-        
-        if our_cruise.get('avoid_big_pots', False):
-            base_threshold += 0.08
-
         if equity < base_threshold:
             return CheckAction()
 
@@ -731,8 +867,8 @@ class Player(Bot):
     # CFR Action Selection
     # =====================
 
-    def _get_legal_cfr_actions(self, round_state, active_player):
-        legal = round_state.legal_actions()
+    def _get_legal_cfr_actions(self, legal):
+        """CFR action ids available given the skeleton's legal action set."""
         cfr_legal = []
         if FoldAction in legal:
             cfr_legal.append(FOLD)
@@ -743,14 +879,9 @@ class Player(Bot):
             cfr_legal.append(RAISE_LARGE)
         return cfr_legal
 
-    def _cfr_action_to_skeleton(self, cfr_action, round_state, active_player, aggression_mult=1.0):
-        legal = round_state.legal_actions()
-        my_pip = round_state.pips[active_player]
-        opp_pip = round_state.pips[1 - active_player]
-        my_stack = round_state.stacks[active_player]
-        opp_stack = round_state.stacks[1 - active_player]
-        pot = (STARTING_STACK - my_stack) + (STARTING_STACK - opp_stack)
-        continue_cost = opp_pip - my_pip
+    def _cfr_action_to_skeleton(self, cfr_action, ctx):
+        """Map a CFR action to a skeleton action; raises are scaled by opponent aggression."""
+        round_state, legal, continue_cost, pot = ctx.round_state, ctx.legal, ctx.continue_cost, ctx.pot
         
         if cfr_action == FOLD:
             return FoldAction() if FoldAction in legal else (CheckAction() if CheckAction in legal else CallAction())
@@ -760,46 +891,52 @@ class Player(Bot):
             return CheckAction() if CheckAction in legal else CallAction()
         elif cfr_action == RAISE_SMALL:
             if RaiseAction in legal:
+                aggression_mult = self._opponent_cruise_proximity(ctx.game_state)['aggression']
                 mn, mx = round_state.raise_bounds()
                 return RaiseAction(max(mn, min(mx, int(pot * 0.55 * aggression_mult))))
             return CallAction() if CallAction in legal else CheckAction()
         elif cfr_action == RAISE_LARGE:
             if RaiseAction in legal:
+                aggression_mult = self._opponent_cruise_proximity(ctx.game_state)['aggression']
                 mn, mx = round_state.raise_bounds()
                 return RaiseAction(max(mn, min(mx, int(pot * 1.0 * aggression_mult))))
             return CallAction() if CallAction in legal else CheckAction()
         return CheckAction() if CheckAction in legal else CallAction()
 
-    def pick_cfr_action(self, game_state, round_state, active_player):
-        board = self._get_board_cards(round_state)
-        hole = list(round_state.hands[active_player])
-        my_stack = round_state.stacks[active_player]
-        opp_stack = round_state.stacks[1 - active_player]
-        pot = (STARTING_STACK - my_stack) + (STARTING_STACK - opp_stack)
-        effective_stack = min(my_stack, opp_stack)
-        street = self._get_street(round_state)
-        hole_strs = self._to_card_strings(hole)
-        board_strs = self._to_card_strings(board)
-        cfr_legal = self._get_legal_cfr_actions(round_state, active_player)
+    def _weighted_pick(self, probs):
+        """Sample an action from an {action: weight} dict; CHECK_CALL if all weights are 0."""
+        total = sum(probs.values())
+        if total <= 0:
+            return CHECK_CALL
+        r = self._rng.random() * total
+        acc = 0.0
+        for action, weight in probs.items():
+            acc += weight
+            if r < acc:
+                return action
+        return action
+
+    def pick_cfr_action(self, ctx):
+        active_player = ctx.active_player
+        effective_stack = min(ctx.my_stack, ctx.opp_stack)
+        hole_strs = self._cached_hole_strs(ctx.hole)
+        board_strs = self._cached_board_strs(ctx.board)
+        cfr_legal = self._get_legal_cfr_actions(ctx.legal)
         
         probs = self.cfr.get_action_probs(
-            player=active_player, street=street, hole_cards=hole_strs, board_cards=board_strs,
-            pot=pot, effective_stack=effective_stack, betting_history=self.betting_history,
+            player=active_player, street=ctx.street, hole_cards=hole_strs, board_cards=board_strs,
+            pot=ctx.pot, effective_stack=effective_stack, betting_history=self.betting_history,
             bb_discarded=self.bb_discarded, sb_discarded=self.sb_discarded, legal_actions=cfr_legal,
         )
         
-        cfr_hit = getattr(self.cfr, '_last_lookup_hit', False)
+        cfr_hit = self.cfr._last_lookup_hit
         if cfr_hit:
             self.cfr_hits += 1
         else:
             self.cfr_misses += 1
         
-        actions = list(probs.keys())
-        weights = [probs[a] for a in actions]
-        cfr_action = random.choices(actions, weights=weights, k=1)[0] if sum(weights) > 0 else CHECK_CALL
-        
-        opp_cruise = self._opponent_cruise_proximity(game_state)
-        skeleton_action = self._cfr_action_to_skeleton(cfr_action, round_state, active_player, opp_cruise['aggression'])
+        cfr_action = self._weighted_pick(probs)
+        skeleton_action = self._cfr_action_to_skeleton(cfr_action, ctx)
         
         return cfr_action, skeleton_action, cfr_hit
 
@@ -807,57 +944,60 @@ class Player(Bot):
     # Main Action Logic
     # =====================
 
-    def get_betting_action(self, game_state, round_state, active_player):
-        legal = round_state.legal_actions()
-        board = self._get_board_cards(round_state)
-        hole = list(round_state.hands[active_player])
-        my_pip = round_state.pips[active_player]
-        opp_pip = round_state.pips[1 - active_player]
-        my_stack = round_state.stacks[active_player]
-        opp_stack = round_state.stacks[1 - active_player]
-        pot = (STARTING_STACK - my_stack) + (STARTING_STACK - opp_stack)
-        continue_cost = opp_pip - my_pip
-        our_cruise = self._our_cruise_proximity(game_state)
+    def _make_context(self, game_state, round_state, active_player, legal):
+        """Build the DecisionContext for one betting decision."""
+        _, _, continue_cost, my_stack, opp_stack, pot = self._extract_state(round_state, active_player)
+        return DecisionContext(
+            game_state, round_state, active_player, legal,
+            self._get_board_cards(round_state), list(round_state.hands[active_player]),
+            my_stack, opp_stack, pot, continue_cost, self._get_street(round_state),
+        )
+
+    def get_betting_action(self, ctx):
+        legal, board, hole = ctx.legal, ctx.board, ctx.hole
+        continue_cost, my_stack, opp_stack, pot = ctx.continue_cost, ctx.my_stack, ctx.opp_stack, ctx.pot
+
+        # Forced move (e.g. the non-discarding player's check on a discard
+        # street): no overrides, CFR lookup or MC needed
+        if len(legal) == 1:
+            action_cls = next(iter(legal))
+            cfr_action = _ACTION_TO_CFR.get(action_cls, CHECK_CALL)
+            self.betting_history.append(ctx.active_player << HIST_PLAYER_SHIFT | cfr_action)
+            return action_cls()
         
-        # Safety Override: Big Bets
+        # Overrides only apply facing a bet; preflop our nuttedness counts as 0
         if continue_cost > 0:
+            # Safety Override: Big Bets
             bet_analysis = self._analyze_bet(continue_cost, pot, my_stack, opp_stack)
             our_nuttedness = self._compute_our_nuttedness(hole, board) if len(board) >= 2 else 0
             
-            if bet_analysis['shove'] and our_nuttedness < 7:
-                return FoldAction() if FoldAction in legal else CheckAction()
-            elif bet_analysis['type'] == 'MASSIVE_OVERBET' and our_nuttedness < 6:
-                return FoldAction() if FoldAction in legal else CheckAction()
-            elif bet_analysis['type'] == 'OVERBET' and our_nuttedness < 5:
-                return FoldAction() if FoldAction in legal else CheckAction()
-        
-        # Cruise Proximity Override
-        if our_cruise['status'] == 'ALMOST_THERE' and continue_cost > 0:
-            our_nuttedness = self._compute_our_nuttedness(hole, board) if len(board) >= 2 else 0
-            pot_odds = continue_cost / (pot + continue_cost)
-            if our_nuttedness < 5 and pot_odds > 0.15:
+            if bet_analysis.overbet and our_nuttedness < bet_analysis.min_nut:
                 return FoldAction() if FoldAction in legal else CheckAction()
+            
+            # Cruise Proximity Override
+            if self._our_cruise_proximity(ctx.game_state)['status'] == 'ALMOST_THERE':
+                pot_odds = continue_cost / (pot + continue_cost)
+                if our_nuttedness < 5 and pot_odds > 0.15:
+                    return FoldAction() if FoldAction in legal else CheckAction()
         
         # Try CFR Strategy
-        cfr_action, skeleton_action, cfr_hit = self.pick_cfr_action(game_state, round_state, active_player)
+        cfr_action, skeleton_action, cfr_hit = self.pick_cfr_action(ctx)
         
         # If CFR missed, use FULL MC fallback
         if not cfr_hit:
             street_n = len(board)
             if street_n == 0:
-                skeleton_action = self.mc_preflop_action(game_state, round_state, active_player)
+                skeleton_action = self.mc_preflop_action(ctx)
             else:
-                skeleton_action = self.mc_postflop_action(game_state, round_state, active_player)
+                skeleton_action = self.mc_postflop_action(ctx)
             
             # Map back for history
-            if isinstance(skeleton_action, FoldAction):
-                cfr_action = FOLD
-            elif isinstance(skeleton_action, (CheckAction, CallAction)):
-                cfr_action = CHECK_CALL
-            elif isinstance(skeleton_action, RaiseAction):
-                cfr_action = RAISE_LARGE if skeleton_action.amount > pot * 0.7 else RAISE_SMALL
-        
-        self.betting_history.append((active_player, cfr_action))
+            cfr_action = _ACTION_TO_CFR.get(type(skeleton_action))
+            if cfr_action is None:
+                # Large if the raise is over 0.7x pot, compared exactly in integers
+                cfr_action = RAISE_LARGE if skeleton_action.amount * 10 > pot * 7 else RAISE_SMALL
+        
+        self.betting_history.append(ctx.active_player << HIST_PLAYER_SHIFT | cfr_action)
         return skeleton_action
 
     # =====================
@@ -866,9 +1006,14 @@ class Player(Bot):
 
     def handle_new_round(self, game_state, round_state, active_player):
         self.total_hands += 1
-        self.betting_history = []
+        self.betting_history.clear()
         self.bb_discarded = False
         self.sb_discarded = False
+        self._preflop_cache_key = None
+        self._preflop_cache_val = None
+        self._round_cache.clear()
+        self._hole_strs_cache = (-1, None)
+        self._board_strs_cache = (-1, None)
 
     def handle_round_over(self, game_state, terminal_state, active_player):
         my_delta = terminal_state.deltas[active_player]
@@ -902,7 +1047,8 @@ class Player(Bot):
                 self.sb_discarded = True
             return DiscardAction(idx)
 
-        return self.get_betting_action(game_state, round_state, active_player)
+        ctx = self._make_context(game_state, round_state, active_player, legal)
+        return self.get_betting_action(ctx)
 
 
 if __name__ == "__main__":